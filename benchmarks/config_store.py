@@ -0,0 +1,75 @@
+"""Compare count.config with the deepcopy-on-every-access store it replaced.
+
+    poetry run python benchmarks/config_store.py
+"""
+from __future__ import annotations
+
+import timeit
+from copy import deepcopy as copy
+from itertools import cycle
+from pathlib import Path
+from typing import Dict, Optional
+
+import discord.ext.commands as commands
+
+from count import config
+from count.common import ConfigKey
+
+NUMBER = 100_000
+
+# Setting alternates between two values, so every set is a change.
+VALUES = {
+    "path": (Path(__file__).resolve(), Path(__file__).resolve().parent),
+    "dict": (
+        {"prefix": ".", "seconds": 3, "commands": ["go", "pause"]},
+        {"prefix": "!", "seconds": 5, "commands": ["go", "pause"]},
+    ),
+}
+
+
+class DeepcopyConfigCog(commands.Cog, name="Deepcopy Config Storage"):
+    def __init__(self, data: Dict[object, object]) -> None:
+        self.data = data
+
+
+def deepcopy_get(bot: commands.Bot, key: object) -> Optional[object]:
+    conf = bot.get_cog(DeepcopyConfigCog.__cog_name__)
+    if not conf:
+        return None
+    return copy(conf.data.get(key))  # type: ignore
+
+
+def deepcopy_set(bot: commands.Bot, key: object, value: object) -> bool:
+    conf = bot.get_cog(DeepcopyConfigCog.__cog_name__)
+    if not conf:
+        return False
+    conf.data[key] = copy(value)  # type: ignore
+    return True
+
+
+def main() -> None:
+    bot = commands.Bot(command_prefix=".")
+    bot.add_cog(DeepcopyConfigCog({}))
+    config.install(bot)
+
+    for name, pair in VALUES.items():
+        key = (ConfigKey.AUDIO_CONFIG_PATH, name)
+        deepcopy_set(bot, key, pair[0])
+        config.set(bot, key, pair[0])
+        values = cycle(pair)
+
+        cases = {
+            "get (deepcopy)": lambda: deepcopy_get(bot, key),
+            "get (snapshot)": lambda: config.get(bot, key),
+            "set (deepcopy)": lambda: deepcopy_set(bot, key, next(values)),
+            "set (snapshot)": lambda: config.set(bot, key, next(values)),
+        }
+
+        print(f"{name}:")
+        for case, func in cases.items():
+            seconds = timeit.timeit(func, number=NUMBER)
+            print(f"  {case:<16} {seconds / NUMBER * 1e9:>8.0f} ns/op")
+
+
+if __name__ == "__main__":
+    main()
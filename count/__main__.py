@@ -113,6 +113,23 @@ class PathPath(click.Path):
         allow_dash=False,
     ),
 )
+@click.option(
+    "--data-dir",
+    "-d",
+    "data_dir",
+    help="Directory to store data that persists between restarts.",
+    metavar="<path>",
+    envvar="COUNT_BOT_DATA_DIR",
+    default="data",
+    show_default=True,
+    type=PathPath(
+        file_okay=False,
+        dir_okay=True,
+        writable=True,
+        resolve_path=True,
+        allow_dash=False,
+    ),
+)
 @click.option(
     "--prefix",
     "-p",
@@ -153,6 +170,7 @@ def cli(
     token: str,
     owners: Sequence[int],
     config: Path,
+    data_dir: Path,
     prefix: str,
     log_level: str,
     dpy_log_level: str,
@@ -178,7 +196,7 @@ def cli(
         diagnose=show_debug_info,
     )
 
-    bot = new_bot(prefix, owners, config)
+    bot = new_bot(prefix, owners, config, data_dir)
     try:
         bot.run(token)
     except discord.PrivilegedIntentsRequired:
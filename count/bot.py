@@ -1,13 +1,13 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, Any, Collection
+from typing import TYPE_CHECKING, Any, Collection, List
 
 import discord
 import discord.ext.commands as commands
 from loguru import logger
 
-from count import config
-from count.common import ConfigKey
+from count import config, settings, telemetry
+from count.common import ConfigKey, GuildSetting
 from count.errors import ShowFailureInChat
 
 if TYPE_CHECKING:
@@ -65,13 +65,29 @@ async def log_command_usage(ctx: commands.Context) -> None:
     logger.info(msg)
 
 
+def resolve_prefix(bot: commands.Bot, message: discord.Message) -> List[str]:
+    """Get the prefixes for the guild the message was sent in.
+
+    Mentioning the bot always works, in case a guild's prefix is lost.
+    """
+    default = config.get(bot, ConfigKey.PREFIX)
+    guild_id = message.guild.id if message.guild else None
+    prefix = settings.get(bot, guild_id, GuildSetting.PREFIX, default)
+    return commands.when_mentioned_or(prefix)(bot, message)  # type: ignore
+
+
 @logger.catch
-def new_bot(prefix: str, owners: Collection[int], audio_config_path: Path) -> Bot:
+def new_bot(
+    prefix: str,
+    owners: Collection[int],
+    audio_config_path: Path,
+    data_dir: Path,
+) -> Bot:
     """Create a new bot instance with cogs loaded."""
 
     # the member cache is extremely flaky without the 'members' intent.
     bot = Bot(
-        command_prefix=prefix,
+        command_prefix=resolve_prefix,
         case_insensitive=True,
         owner_ids=set(owners),
         description="Counts down for you, so you have an easier time staying in sync.",
@@ -82,8 +98,12 @@ def new_bot(prefix: str, owners: Collection[int], audio_config_path: Path) -> Bo
 
     initial_config = {
         ConfigKey.AUDIO_CONFIG_PATH: audio_config_path,
+        ConfigKey.DATA_DIR: data_dir,
+        ConfigKey.PREFIX: prefix,
     }
     config.install(bot, initial_config)
+    settings.install(bot, data_dir / "settings.sqlite3")
+    telemetry.install(bot)
 
     bot.load_extension("count.core")
     bot.load_extension("count.play")
@@ -5,3 +5,11 @@ from enum import Enum, auto
 
 class ConfigKey(Enum):
     AUDIO_CONFIG_PATH = auto()
+    DATA_DIR = auto()
+    PREFIX = auto()
+
+
+class GuildSetting(Enum):
+    # The values are stored on disk, don't change them.
+    PREFIX = "prefix"
+    COUNTDOWN = "countdown"
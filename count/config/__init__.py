@@ -2,6 +2,18 @@ __all__ = (
     "install",
     "get",
     "set",
+    "snapshot",
+    "subscribe",
+    "unsubscribe",
+    "Snapshot",
 )
 
-from count.config.config import get, install, set
+from count.config.config import (
+    Snapshot,
+    get,
+    install,
+    set,
+    snapshot,
+    subscribe,
+    unsubscribe,
+)
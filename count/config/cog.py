@@ -1,16 +1,20 @@
 from __future__ import annotations
 
-from typing import Dict, Optional, TypeVar, Type
+from typing import TYPE_CHECKING, Dict, Optional, Tuple, Type, TypeVar
 
 import discord.ext.commands as commands
 
+if TYPE_CHECKING:
+    from count.config.config import Snapshot, Subscriber
+
 Cls = TypeVar("Cls")
 
 
 class ConfigCog(commands.Cog, name="Config Storage"):
-    def __init__(self, bot: commands.Bot, data: Dict[object, object]) -> None:
+    def __init__(self, bot: commands.Bot, snapshot: Snapshot) -> None:
         self.bot = bot
-        self.data = data
+        self.snapshot = snapshot
+        self.subscribers: Dict[object, Tuple[Subscriber, ...]] = {}
 
     @classmethod
     def get_instance(cls: Type[Cls], bot: commands.Bot) -> Optional[Cls]:
@@ -1,14 +1,55 @@
 from __future__ import annotations
 
 from copy import deepcopy as copy
-from typing import Dict, Optional, TypeVar
+from enum import Enum
+from pathlib import PurePath
+from types import MappingProxyType
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    FrozenSet,
+    Mapping,
+    NamedTuple,
+    Optional,
+    Sequence,
+    TypeVar,
+)
 
 import discord.ext.commands as commands
+from loguru import logger
 
 from count.config.cog import ConfigCog
 
 T = TypeVar("T")
 
+Subscriber = Callable[[commands.Bot, Any], None]
+
+# Values of these types can be shared without being copied. Tuples and
+# frozensets are also immutable, as long as everything inside them is.
+IMMUTABLE_TYPES = (type(None), bool, int, float, complex, str, bytes, Enum, PurePath)
+
+_MISSING = object()
+
+
+class Snapshot(NamedTuple):
+    """A version of the data stored in the bot, which is never modified.
+
+    Keys in `mutable` have values that must be copied before they're
+    handed out, everything else can be shared.
+    """
+
+    version: int
+    data: Mapping[object, object]
+    mutable: FrozenSet[object]
+
+
+def is_immutable(value: object) -> bool:
+    """Check if a value (and everything in it) can't be modified."""
+    if isinstance(value, (tuple, frozenset)):
+        return all(is_immutable(item) for item in value)
+    return isinstance(value, IMMUTABLE_TYPES)
+
 
 def install(
     bot: commands.Bot,
@@ -23,24 +64,130 @@ def install(
         data = copy(initial_config)
     else:
         data = {}
-    bot.add_cog(ConfigCog(bot, data))
+    mutable = frozenset(key for key, value in data.items() if not is_immutable(value))
+    conf = ConfigCog(bot, Snapshot(0, MappingProxyType(data), mutable))
+    bot.add_cog(conf)
+
+
+def snapshot(bot: commands.Bot) -> Optional[Snapshot]:
+    """Get the current version of the data stored in the bot.
+
+    Mutable values in the snapshot are shared, don't modify them.
+    """
+    conf = ConfigCog.get_instance(bot)
+    if not conf:
+        return None
+    return conf.snapshot
 
 
 def get(bot: commands.Bot, key: object, default: object = None) -> Optional[object]:
-    """Get a copy of data stored in the bot."""
+    """Get a copy of data stored in the bot.
+
+    Immutable values aren't copied, so this is free for most values.
+    """
     conf = ConfigCog.get_instance(bot)
     if not conf:
         return None
-    return copy(conf.data.get(key, default))
+    current = conf.snapshot
+    value = current.data.get(key, _MISSING)
+    if value is _MISSING:
+        return default
+    if key in current.mutable:
+        return copy(value)
+    return value
 
 
 def set(bot: commands.Bot, key: object, value: T) -> bool:
     """Set a key in the bot storage to a copy of the data.
 
+    If the value changed, a new snapshot is created and subscribers to
+    the key are notified. A subscriber can reject the value by raising
+    before it changes anything. The previous data is then published as
+    another new snapshot, and subscribers that were already notified are
+    notified again with the previous value.
+
     Returns True if the value was set successfully.
     """
     conf = ConfigCog.get_instance(bot)
     if not conf:
         return False
-    conf.data[key] = copy(value)
+
+    old = conf.snapshot
+    # 1 == True, but they aren't the same value.
+    current = old.data.get(key, _MISSING)
+    if type(current) is type(value) and current == value:
+        return True
+
+    if is_immutable(value):
+        stored: object = value
+        mutable = old.mutable - {key}
+    else:
+        stored = copy(value)
+        mutable = old.mutable | {key}
+
+    data = MappingProxyType({**old.data, key: stored})
+    conf.snapshot = Snapshot(old.version + 1, data, mutable)
+
+    # Subscribers may (un)subscribe while being notified.
+    notified = []
+    for subscriber in conf.subscribers.get(key, ()):
+        try:
+            subscriber(bot, get(bot, key))
+        except Exception:
+            logger.exception(f"Subscriber to {key} rejected the value:")
+            revert(bot, key, old, notified)
+            return False
+        notified.append(subscriber)
+
+    return True
+
+
+def revert(
+    bot: commands.Bot,
+    key: object,
+    old: Snapshot,
+    notified: Sequence[Subscriber],
+) -> None:
+    """Publish the data from an old snapshot as a new version, and notify
+    the subscribers that were given the rejected value.
+    """
+    conf = ConfigCog.get_instance(bot)
+    if not conf:
+        return None
+
+    # Versions are never reused, so the rejected data keeps its own.
+    version = conf.snapshot.version + 1
+    conf.snapshot = Snapshot(version, old.data, old.mutable)
+
+    for subscriber in notified:
+        try:
+            subscriber(bot, get(bot, key))
+        except Exception:
+            logger.exception(f"Subscriber to {key} failed to restore the value:")
+
+
+def subscribe(bot: commands.Bot, key: object, subscriber: Subscriber) -> bool:
+    """Call `subscriber` with the bot and the new value when a key is set.
+
+    Returns True if the subscriber was added successfully.
+    """
+    conf = ConfigCog.get_instance(bot)
+    if not conf:
+        return False
+    conf.subscribers[key] = (*conf.subscribers.get(key, ()), subscriber)
+    return True
+
+
+def unsubscribe(bot: commands.Bot, key: object, subscriber: Subscriber) -> bool:
+    """Stop calling a subscriber when a key is set.
+
+    Returns True if the subscriber was removed successfully.
+    """
+    conf = ConfigCog.get_instance(bot)
+    if not conf:
+        return False
+    subscribers = conf.subscribers.get(key, ())
+    if subscriber not in subscribers:
+        return False
+    conf.subscribers[key] = tuple(s for s in subscribers if s != subscriber)
     return True
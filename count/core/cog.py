@@ -1,11 +1,19 @@
 from __future__ import annotations
+
+import asyncio
+from pathlib import Path
 from typing import Callable
 
 import discord.ext.commands as commands
 from loguru import logger
 
+from count import telemetry
+from count.core.profiler import SamplingProfiler
 from count.errors import fail
 
+PROFILE_DIRECTORY = Path("profiles")
+MAX_PROFILE_SECONDS = 600
+
 
 def qualified_name(name: str) -> str:
     # if it's dotted, it's already qualified. assume it's fully qualified.
@@ -20,9 +28,11 @@ class CoreCommands(commands.Cog, name="Bot"):
         self._old_help = bot.help_command
         bot.help_command = commands.DefaultHelpCommand()
         bot.help_command.cog = self
+        self.profiler = SamplingProfiler()
 
     def cog_unload(self) -> None:
         self.bot.help_command = self._old_help
+        self.profiler.stop()
 
     @commands.command()
     @commands.is_owner()
@@ -32,6 +42,80 @@ class CoreCommands(commands.Cog, name="Bot"):
         await ctx.bot.logout()
         logger.success("Bot has been closed.")
 
+    @commands.command(name="telemetry")
+    @commands.is_owner()
+    async def telemetry_summary(self, ctx: commands.Context) -> None:
+        """Show event loop lag and audio frame timings"""
+        summary = telemetry.summary(ctx.bot)
+        if not summary:
+            fail("Telemetry isn't installed.")
+        await ctx.send(f"```\n{summary}\n```")
+
+    @commands.group()
+    @commands.is_owner()
+    async def profile(self, ctx: commands.Context) -> None:
+        """Profile the running bot"""
+        if not ctx.subcommand_passed:
+            await ctx.send_help(self.profile)
+
+    @profile.command(name="start")
+    async def profile_start(self, ctx: commands.Context, seconds: int = 60) -> None:
+        """Start sampling every thread, discarding the previous samples"""
+        if self.profiler.running:
+            fail("The profiler is already running.")
+
+        if seconds <= 0:
+            fail("Can't profile for less than 1 second.")
+
+        if seconds > MAX_PROFILE_SECONDS:
+            fail(f"Can only profile for up to {MAX_PROFILE_SECONDS} seconds.")
+
+        self.profiler.start(seconds)
+        logger.info(f"Profiling for up to {seconds} seconds.")
+        await ctx.message.add_reaction("✅")
+
+    @profile.command(name="stop")
+    async def profile_stop(self, ctx: commands.Context) -> None:
+        """Stop sampling early"""
+        if not self.profiler.running:
+            fail("The profiler isn't running.")
+
+        # Stopping waits for the sampling thread to finish.
+        loop = asyncio.get_event_loop()
+        await loop.run_in_executor(None, self.profiler.stop)
+        logger.info("Stopped profiling.")
+        await ctx.message.add_reaction("✅")
+
+    @profile.command(name="dump")
+    async def profile_dump(self, ctx: commands.Context) -> None:
+        """Write the samples to a flamegraph-compatible file"""
+        # Samples are still being added while it's running, so the file and
+        # the summary wouldn't agree.
+        if self.profiler.running:
+            fail("The profiler is still running, stop it first.")
+
+        subsystems, idle = self.profiler.totals()
+        if not subsystems and not idle:
+            fail("There are no samples, use the start command first.")
+
+        loop = asyncio.get_event_loop()
+        path = await loop.run_in_executor(
+            None,
+            self.profiler.dump,
+            PROFILE_DIRECTORY,
+        )
+        logger.success(f"Wrote profile to '{path.resolve()}'")
+
+        # Percentages are of busy samples, idle threads are counted apart.
+        busy = sum(subsystems.values())
+        lines = [
+            f"{name}: {count / busy:.1%}" for name, count in subsystems.most_common()
+        ]
+        lines.append(f"({busy} busy samples, {idle} idle samples)")
+        lines.append(f"Written to: {path.resolve()}")
+        summary = "\n".join(lines)
+        await ctx.send(f"```\n{summary}\n```")
+
     @commands.group()
     @commands.is_owner()
     async def ext(self, ctx: commands.Context) -> None:
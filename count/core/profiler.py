@@ -0,0 +1,173 @@
+from __future__ import annotations
+
+import linecache
+import sys
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+from types import FrameType
+from typing import Counter as CounterType
+from typing import Dict, Optional, Tuple
+
+import discord
+
+# Samples are attributed to the innermost frame from one of these
+# modules (or their submodules). Order doesn't matter.
+SUBSYSTEMS: Dict[str, Tuple[str, ...]] = {
+    "count.play.audio": ("count.play.audio",),
+    "count.play.cog": ("count.play.cog", "count.play.broadcast"),
+    "discord gateway": ("discord.gateway", "discord.state", "discord.http"),
+    "logging": ("logging", "loguru"),
+}
+OTHER_SUBSYSTEM = "other"
+
+# Threads whose innermost frame is one of these are waiting, not working.
+# Builtins like time.sleep don't have a frame, so the line being run by
+# the innermost frame is checked for a call to sleep instead.
+IDLE_FRAMES = {
+    ("selectors", "select"),
+    ("threading", "wait"),
+    ("queue", "get"),
+}
+IDLE_CALL = "sleep("
+
+Stack = Tuple[str, ...]
+
+
+class SamplingProfiler:
+    """Periodically sample the stack of every thread for a limited time.
+
+    Samples are collected on a background thread, so the event loop and
+    the audio player threads are profiled without being instrumented.
+    Samples from threads that are waiting are only counted as `idle`.
+    """
+
+    def __init__(self, interval: float = 0.01) -> None:
+        self.interval = interval
+        self.stacks: CounterType[Stack] = Counter()
+        self.subsystems: CounterType[str] = Counter()
+        self.idle = 0
+        self.started_at: Optional[float] = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._loop_thread_id: Optional[int] = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self, duration: float) -> None:
+        """Discard previous samples and sample for `duration` seconds.
+
+        Must be called from the event loop's thread.
+        """
+        with self._lock:
+            self.stacks.clear()
+            self.subsystems.clear()
+            self.idle = 0
+
+        self.started_at = time.time()
+        self._loop_thread_id = threading.get_ident()
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run,
+            args=(duration,),
+            name="count-profiler",
+            daemon=True,
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+
+    def _run(self, duration: float) -> None:
+        end = time.perf_counter() + duration
+        while not self._stop.wait(self.interval) and time.perf_counter() < end:
+            self.sample()
+
+    def sample(self) -> None:
+        own_id = threading.get_ident()
+        threads = {thread.ident: thread for thread in threading.enumerate()}
+
+        for thread_id, frame in sys._current_frames().items():
+            if thread_id == own_id:
+                continue
+
+            if is_idle(frame):
+                with self._lock:
+                    self.idle += 1
+                continue
+
+            stack, subsystem = self._walk(frame)
+            root = self._thread_label(thread_id, threads.get(thread_id))
+            with self._lock:
+                self.stacks[(root, *stack)] += 1
+                self.subsystems[subsystem] += 1
+
+    def _thread_label(
+        self,
+        thread_id: int,
+        thread: Optional[threading.Thread],
+    ) -> str:
+        if thread_id == self._loop_thread_id:
+            return "event-loop"
+        if isinstance(thread, discord.player.AudioPlayer):
+            return "audio-player"
+        if thread:
+            return thread.name.replace(" ", "_")
+        return f"thread-{thread_id}"
+
+    def _walk(self, frame: Optional[FrameType]) -> Tuple[Stack, str]:
+        """Get the stack (outermost first) and subsystem of a frame."""
+        names = []
+        subsystem = None
+
+        while frame is not None:
+            module = frame.f_globals.get("__name__", "?")
+            names.append(f"{module}:{frame.f_code.co_name}")
+            if subsystem is None:
+                subsystem = module_subsystem(module)
+            frame = frame.f_back
+
+        names.reverse()
+        return tuple(names), subsystem or OTHER_SUBSYSTEM
+
+    def totals(self) -> Tuple[CounterType[str], int]:
+        """Get a copy of the busy samples of each subsystem, and idle samples."""
+        with self._lock:
+            return Counter(self.subsystems), self.idle
+
+    def folded(self) -> str:
+        """Get the samples in the folded format used by flamegraph tools."""
+        with self._lock:
+            stacks = list(self.stacks.items())
+        return "".join(f"{';'.join(stack)} {count}\n" for stack, count in stacks)
+
+    def dump(self, directory: Path) -> Path:
+        """Write the folded samples to a new file in the directory."""
+        directory.mkdir(parents=True, exist_ok=True)
+        timestamp = time.strftime("%Y%m%d-%H%M%S", time.localtime(self.started_at))
+        path = directory / f"count-{timestamp}.folded"
+        path.write_text(self.folded())
+        return path
+
+
+def is_idle(frame: FrameType) -> bool:
+    """Check if the innermost frame of a thread is blocked waiting."""
+    module = frame.f_globals.get("__name__", "?")
+    if (module, frame.f_code.co_name) in IDLE_FRAMES:
+        return True
+    line = linecache.getline(frame.f_code.co_filename, frame.f_lineno)
+    return IDLE_CALL in line
+
+
+def module_subsystem(module: str) -> Optional[str]:
+    for subsystem, prefixes in SUBSYSTEMS.items():
+        for prefix in prefixes:
+            if module == prefix or module.startswith(f"{prefix}."):
+                return subsystem
+    return None
@@ -1,27 +1,117 @@
 from __future__ import annotations
 
+import asyncio
 from pathlib import Path
+from typing import NamedTuple, Optional
 
 import discord.ext.commands as commands
+from loguru import logger
 
 from count import config
 from count.common import ConfigKey
-from count.play.audio import config_to_assets
+from count.play.audio import Countdown, config_to_assets
 from count.play.cog import create_play_cog
+from count.play.popularity import Popularity
 
 COG_NAME = "Play"
 
+POPULARITY_FILE_NAME = "popularity.json"
+MAX_CACHED_RENDERS = 32
+PRECOMPUTED_RENDERS = 8
+# How long new uses can wait in memory before they're written to disk.
+SAVE_INTERVAL = 60
+
+
+class PlayState(NamedTuple):
+    countdown: Countdown
+    popularity_path: Path
+    save_task: asyncio.Task
+
+
+# Kept out of the cog, a command with the same name would replace it.
+_state: Optional[PlayState] = None
+
 
 def setup(bot: commands.Bot) -> None:
+    global _state
+
     path = config.get(bot, ConfigKey.AUDIO_CONFIG_PATH)
+    data_dir = config.get(bot, ConfigKey.DATA_DIR)
 
-    if isinstance(path, Path):
+    if isinstance(path, Path) and isinstance(data_dir, Path):
         assets = config_to_assets(path)
-        cog = create_play_cog(COG_NAME, assets)
+        popularity_path = data_dir / POPULARITY_FILE_NAME
+        popularity = Popularity.load(popularity_path)
+        countdown = Countdown(assets, popularity, MAX_CACHED_RENDERS)
+        cog = create_play_cog(COG_NAME, assets, countdown)
         bot.add_cog(cog)
+        save_task = bot.loop.create_task(save_periodically(popularity, popularity_path))
+        _state = PlayState(countdown, popularity_path, save_task)
     else:
         raise ValueError("")
 
+    config.subscribe(bot, ConfigKey.AUDIO_CONFIG_PATH, reload_audio)
+
+    # Rendering is slow and blocking, warm the cache in the background.
+    future = bot.loop.run_in_executor(
+        None,
+        countdown.precompute,
+        PRECOMPUTED_RENDERS,
+    )
+    future.add_done_callback(log_precompute)
+
 
 def teardown(bot: commands.Bot) -> None:
+    global _state
+
+    config.unsubscribe(bot, ConfigKey.AUDIO_CONFIG_PATH, reload_audio)
     bot.remove_cog(COG_NAME)
+
+    if _state:
+        countdown, popularity_path, save_task = _state
+        _state = None
+        save_task.cancel()
+        stats = countdown.stats()
+        hits = f"{stats.hits} hits, {stats.misses} misses"
+        logger.info(f"Render cache hit rate: {stats.hit_rate:.1%} ({hits})")
+        countdown.popularity.save(popularity_path)
+
+
+async def save_periodically(popularity: Popularity, path: Path) -> None:
+    """Save new uses regularly, so they aren't lost if the bot crashes."""
+    loop = asyncio.get_event_loop()
+    while True:
+        await asyncio.sleep(SAVE_INTERVAL)
+        if not popularity.dirty:
+            continue
+        try:
+            await loop.run_in_executor(None, popularity.save, path)
+        except Exception:
+            logger.exception("Failed to save popularity, will retry:")
+
+
+def log_precompute(future: asyncio.Future) -> None:
+    if future.cancelled():
+        return
+    error = future.exception()
+    if error:
+        logger.opt(exception=error).error("Failed to precompute renders:")
+    else:
+        logger.info(f"Precomputed {future.result()} popular renders.")
+
+
+def reload_audio(bot: commands.Bot, path: object) -> None:
+    """Reload this extension to use the new audio config.
+
+    The cog is built from the new config first. If that raises, the
+    current commands stay loaded and `config.set` restores the old path.
+    Otherwise discord.py's rollback would rerun `setup` with the new path,
+    which would fail in the same way and leave no commands loaded.
+    """
+    if not isinstance(path, Path):
+        raise TypeError(f"Expected a path to the audio config, got {path!r}")
+
+    create_play_cog(COG_NAME, config_to_assets(path))
+
+    logger.info(f"Audio config path changed to '{path}', reloading.")
+    bot.reload_extension(__name__)
@@ -1,13 +1,16 @@
 from __future__ import annotations
 
 import os
+import threading
 from configparser import ConfigParser
 from pathlib import Path
 from string import Template, whitespace
-from typing import Dict, Mapping, Tuple
+from typing import Dict, Mapping, NamedTuple, Optional
 
 from pydub import AudioSegment
 
+from count.play.popularity import Popularity, RenderKey
+
 CommandAssets = Dict[int, AudioSegment]
 PlayCogCommandStructure = Dict[str, CommandAssets]
 
@@ -96,10 +99,27 @@ def path_to_audio(path: str, relative_path_root: Path) -> AudioSegment:
     return segment
 
 
+class CacheStats(NamedTuple):
+    hits: int
+    misses: int
+    resident: int
+    resident_bytes: int
+
+    @property
+    def hit_rate(self) -> float:
+        requests = self.hits + self.misses
+        return self.hits / requests if requests else 0.0
+
+
 class Countdown:
     """Create audio that never stutters by dynamically combining files."""
 
-    def __init__(self, assets: PlayCogCommandStructure) -> None:
+    def __init__(
+        self,
+        assets: PlayCogCommandStructure,
+        popularity: Optional[Popularity] = None,
+        max_cached: Optional[int] = None,
+    ) -> None:
         # Using a cache to avoid the (possibly) expensive duplicate
         # work. The only way the cache can become invalid is if the dict
         # gets mutated, copy it to ensure there are no other references
@@ -107,7 +127,13 @@ class Countdown:
         self._assets: PlayCogCommandStructure = {
             key: {**values} for key, values in assets.items()
         }
-        self._cache: Dict[Tuple[int, str], bytes] = {}
+        self._cache: Dict[RenderKey, bytes] = {}
+        # Renders can be precomputed from another thread.
+        self._cache_lock = threading.Lock()
+        self.popularity = popularity or Popularity()
+        self.max_cached = max_cached
+        self.hits = 0
+        self.misses = 0
 
     def __call__(self, seconds: int, command: str) -> bytes:
         """Generate PCM audio bytes by combining stored audio data.
@@ -118,10 +144,51 @@ class Countdown:
             raise KeyError(f"The command ({command}) is not a stored asset.")
 
         cache_key = (seconds, command)
-        command_assets = self._assets[command]
+        self.popularity.hit(cache_key)
+
+        cached = self._cache.get(cache_key)
+        if cached is not None:
+            self.hits += 1
+            return cached
 
-        if cache_key in self._cache:
-            return self._cache[cache_key]
+        self.misses += 1
+        pcm_bytes = self.render(seconds, command)
+        self._store(cache_key, pcm_bytes)
+        return pcm_bytes
+
+    def precompute(self, count: int) -> int:
+        """Render the most popular countdowns ahead of time, hottest first.
+
+        Returns the number of countdowns that were rendered.
+        """
+        rendered = 0
+        for seconds, command in self.popularity.most_popular(count):
+            cache_key = (seconds, command)
+            if command not in self._assets or cache_key in self._cache:
+                continue
+            self._store(cache_key, self.render(seconds, command))
+            rendered += 1
+        return rendered
+
+    def stats(self) -> CacheStats:
+        with self._cache_lock:
+            resident_bytes = sum(len(pcm) for pcm in self._cache.values())
+            resident = len(self._cache)
+        return CacheStats(self.hits, self.misses, resident, resident_bytes)
+
+    def _store(self, cache_key: RenderKey, pcm_bytes: bytes) -> None:
+        """Cache a render, evicting the least popular if the cache is full."""
+        with self._cache_lock:
+            self._cache[cache_key] = pcm_bytes
+            if self.max_cached is None or len(self._cache) <= self.max_cached:
+                return
+            # The new render may be the one that gets evicted.
+            least_popular = min(self._cache, key=self.popularity.score)
+            del self._cache[least_popular]
+
+    def render(self, seconds: int, command: str) -> bytes:
+        """Combine the audio of a command without using the cache."""
+        command_assets = self._assets[command]
 
         audio = AudioSegment.silent(duration=1000 * seconds)
 
@@ -144,6 +211,4 @@ class Countdown:
         # must be normalized to avoid playback issues.
         safe_audio = audio.set_frame_rate(48000).set_sample_width(2).set_channels(2)
 
-        pcm_bytes = safe_audio.raw_data
-        self._cache[cache_key] = pcm_bytes
-        return pcm_bytes
+        return safe_audio.raw_data
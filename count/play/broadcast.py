@@ -0,0 +1,237 @@
+from __future__ import annotations
+
+import asyncio
+import re
+import threading
+import time
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import discord
+import discord.ext.commands as commands
+from loguru import logger
+
+from count import telemetry
+from count.errors import fail
+
+# Same delay `play_audio` uses between connecting and playing.
+CONNECTION_SETTLE_DELAY = 0.5
+
+# Players are started this long before the start instant, so their threads
+# are running and blocked on the first read when they're released. The
+# player sends frames late by up to this much, then catches up.
+PLAYER_STARTUP_MARGIN = 0.05
+
+# Each player paces its frames from when its own thread started, so only
+# its first few frames are lined up by the start event. The skew is taken
+# from a frame after those have caught up, which is what listeners hear.
+FRAME_DELAY = discord.player.AudioPlayer.DELAY
+ALIGNMENT_FRAME = 10
+
+# If the start is never signalled, play anyway rather than hang forever.
+START_TIMEOUT = 5
+
+ID_PATTERN = re.compile(r"([0-9]{15,21})$|<#([0-9]{15,21})>$")
+
+
+class BroadcastTarget(commands.Converter):
+    """Resolve an argument to the voice channels a broadcast plays in.
+
+    Voice channels are looked up in the current server first. Roles
+    resolve to every voice channel with a member of that role in it.
+    Channel IDs from other servers are allowed, as long as the author
+    is a member of that server too.
+
+    The author must be allowed to move members in every channel.
+    """
+
+    async def convert(
+        self,
+        ctx: commands.Context,
+        argument: str,
+    ) -> List[discord.VoiceChannel]:
+        channels = await self.resolve(ctx, argument)
+
+        for channel in channels:
+            member = channel.guild.get_member(ctx.author.id)
+            if not member or not channel.permissions_for(member).move_members:
+                logger.error(f"{ctx.author} can't move members in {channel!r}.")
+                fail(f"You need permission to move members in '{channel}'.")
+
+        return channels
+
+    async def resolve(
+        self,
+        ctx: commands.Context,
+        argument: str,
+    ) -> List[discord.VoiceChannel]:
+        try:
+            channel = await commands.VoiceChannelConverter().convert(ctx, argument)
+            return [channel]
+        except commands.BadArgument:
+            pass
+
+        try:
+            role = await commands.RoleConverter().convert(ctx, argument)
+        except commands.BadArgument:
+            pass
+        else:
+            channels = {
+                member.voice.channel.id: member.voice.channel
+                for member in role.members
+                if member.voice and member.voice.channel
+            }
+            if not channels:
+                fail(f"Nobody with the role '{role}' is in a voice channel.")
+            return list(channels.values())
+
+        # The converters only look in the current server.
+        match = ID_PATTERN.match(argument)
+        if match:
+            channel = ctx.bot.get_channel(int(match.group(1) or match.group(2)))
+            if isinstance(channel, discord.VoiceChannel):
+                return [channel]
+
+        fail(f"Couldn't find a voice channel or role named '{argument}'.")
+
+
+class SharedOpusAudio(discord.AudioSource):
+    """Play Opus packets that are shared between many voice clients.
+
+    The first read blocks until `start` is set, so no player sends audio
+    before the others are ready. After that, frames are paced by each
+    player, so `paced_from` records when the player's frames are actually
+    scheduled from, to compare the players.
+    """
+
+    def __init__(self, packets: Sequence[bytes], start: threading.Event) -> None:
+        self._packets = packets
+        self._index = 0
+        self._start = start
+        self._released = False
+        self.paced_from: Optional[float] = None
+
+    def read(self) -> bytes:
+        if self._index >= len(self._packets):
+            return b""
+
+        if not self._released:
+            if not self._start.wait(START_TIMEOUT):
+                logger.warning("Broadcast start was never signalled, playing now.")
+            self._released = True
+
+        if self._index == ALIGNMENT_FRAME:
+            self.paced_from = time.perf_counter() - ALIGNMENT_FRAME * FRAME_DELAY
+
+        packet = self._packets[self._index]
+        self._index += 1
+        return packet
+
+    def is_opus(self) -> bool:
+        return True
+
+
+def encode_opus_packets(pcm: bytes) -> Tuple[bytes, ...]:
+    """Encode PCM audio into Opus packets, one per voice frame.
+
+    Like `discord.PCMAudio`, an incomplete final frame is dropped.
+    """
+    encoder = discord.opus.Encoder()
+    frame_size = encoder.FRAME_SIZE
+    last_frame_start = len(pcm) - frame_size + 1
+
+    return tuple(
+        encoder.encode(pcm[offset : offset + frame_size], encoder.SAMPLES_PER_FRAME)
+        for offset in range(0, last_frame_start, frame_size)
+    )
+
+
+async def broadcast_audio(
+    ctx: commands.Context,
+    channels: Sequence[discord.VoiceChannel],
+    seconds: int,
+    audio_bytes: bytes,
+) -> None:
+    """Play the same audio in many voice channels at the same time."""
+    # A bot can only be connected to one voice channel per server.
+    by_guild: Dict[int, discord.VoiceChannel] = {}
+    for channel in channels:
+        existing = by_guild.setdefault(channel.guild.id, channel)
+        if existing != channel:
+            logger.error(f"Multiple channels in one guild: {existing!r}, {channel!r}")
+            fail(f"Can't count in both '{existing}' and '{channel}' at once.")
+
+        if channel.guild.voice_client:
+            logger.error(f"Voice client already exists for guild: {channel.guild!r}.")
+            fail(f"Already counting in '{channel.guild}'.")
+
+    targets = list(by_guild.values())
+    loop = asyncio.get_event_loop()
+
+    # Every channel plays the exact same packets, so they only need to be
+    # encoded once. Encoding is CPU-bound, keep it off the event loop.
+    try:
+        packets = await loop.run_in_executor(None, encode_opus_packets, audio_bytes)
+    except discord.DiscordException as e:
+        fail("Unable to encode audio.", cause=e)
+
+    results = await asyncio.gather(
+        *(channel.connect() for channel in targets),
+        return_exceptions=True,
+    )
+
+    clients: List[discord.VoiceClient] = []
+    failed: List[discord.VoiceChannel] = []
+    for channel, result in zip(targets, results):
+        if isinstance(result, discord.VoiceClient):
+            clients.append(result)
+        else:
+            logger.error(f"Failed to connect to {channel!r}: {result!r}")
+            failed.append(channel)
+
+    if not clients:
+        fail("Failed to connect to any of the voice channels.")
+
+    start = threading.Event()
+    sources = [SharedOpusAudio(packets, start) for _ in clients]
+    players = [
+        telemetry.wrap_source(ctx.bot, vc.guild, source)
+        for vc, source in zip(clients, sources)
+    ]
+
+    # All connections have been established, compute a single instant to
+    # start at. Every player is started just before it, and blocks on its
+    # first read until the event releases all of them together. Players are
+    # started back to back, their frames are only as aligned as that.
+    start_at = loop.time() + CONNECTION_SETTLE_DELAY
+    await asyncio.sleep(start_at - PLAYER_STARTUP_MARGIN - loop.time())
+
+    playing = 0
+    try:
+        for vc, player in zip(clients, players):
+            try:
+                vc.play(player)
+                playing += 1
+            except Exception:
+                logger.opt(exception=True).error(f"Couldn't play in {vc.channel!r}")
+                failed.append(vc.channel)
+
+        await asyncio.sleep(max(0.0, start_at - loop.time()))
+    finally:
+        start.set()
+
+    await asyncio.sleep(seconds + 1)
+
+    # Just in case the final file was longer than 1s, don't cut it off.
+    while any(vc.is_playing() for vc in clients):
+        await asyncio.sleep(1)
+
+    await asyncio.gather(*(vc.disconnect() for vc in clients))
+
+    paced = [source.paced_from for source in sources if source.paced_from]
+    skew_ms = (max(paced) - min(paced)) * 1000 if paced else 0.0
+    logger.info(f"Broadcast to {playing} channels, frame skew: {skew_ms:.2f}ms")
+
+    msg = f"Counted down in {playing} channels (frame skew: {skew_ms:.2f}ms)."
+    if failed:
+        msg += " Couldn't count in: " + ", ".join(f"'{c}'" for c in failed)
+    await ctx.send(msg)
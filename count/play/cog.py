@@ -2,25 +2,71 @@ from __future__ import annotations
 
 import asyncio
 import io
-from typing import cast
+from typing import Dict, Optional, cast
 
 import discord
 import discord.ext.commands as commands
 from loguru import logger
 
+from count import settings, telemetry
+from count.common import GuildSetting
 from count.errors import fail
 from count.play.audio import Countdown, PlayCogCommandStructure
-
-
-def create_play_cog(name: str, all_assets: PlayCogCommandStructure) -> commands.Cog:
-    """Generate a new cog containing commands that play audio."""
-    countdown = Countdown(all_assets)
-
-    cog_dict = {}
+from count.play.broadcast import BroadcastTarget, broadcast_audio
+
+BROADCAST_COMMAND_NAME = "broadcast"
+RENDERS_COMMAND_NAME = "renders"
+# Commands from this cog, and the top-level commands of other cogs.
+RESERVED_COMMAND_NAMES = (
+    BROADCAST_COMMAND_NAME,
+    RENDERS_COMMAND_NAME,
+    "settings",
+    "telemetry",
+    "profile",
+    "ext",
+    "kys",
+    "help",
+)
+
+
+def create_play_cog(
+    name: str,
+    all_assets: PlayCogCommandStructure,
+    countdown: Optional[Countdown] = None,
+) -> commands.Cog:
+    """Generate a new cog containing commands that play audio.
+
+    Commands are named after sections in the audio config, so the cog
+    shouldn't have any other attributes a section could replace.
+    """
+    # The bot ignores case when looking up commands.
+    names = {command_name.lower(): command_name for command_name in all_assets}
+    for reserved in RESERVED_COMMAND_NAMES:
+        if reserved.lower() in names:
+            command_name = names[reserved.lower()]
+            raise KeyError(f"The command name '{command_name}' is reserved.")
+
+    # Commands are attributes of the cog, they can't replace its methods.
+    for command_name in all_assets:
+        if hasattr(commands.Cog, command_name):
+            raise KeyError(f"The command name '{command_name}' is used by the cog.")
+
+    if countdown is None:
+        countdown = Countdown(all_assets)
+
+    cog_dict: Dict[str, object] = {}
+    max_countdowns = {}
     for command_name, data in all_assets.items():
+        if not data:
+            raise ValueError(f"The command '{command_name}' has no audio files.")
         max_countdown = max(data.keys())
         command = create_play_cog_command(command_name, countdown, max_countdown)
         cog_dict[command_name] = command
+        max_countdowns[command_name] = max_countdown
+
+    broadcast = create_broadcast_command(countdown, max_countdowns)
+    cog_dict[BROADCAST_COMMAND_NAME] = broadcast
+    cog_dict[RENDERS_COMMAND_NAME] = create_renders_command(countdown)
 
     NewCog = type(name, (commands.Cog,), cog_dict)
     cog_instance = NewCog()
@@ -41,11 +87,18 @@ def create_play_cog_command(
     Command objects returned by this function are basically shims for
     `play_audio`.
     """
-    default = min(3, max_countdown)
 
     @commands.command(name=command_name)
     @commands.guild_only()
-    async def play(_, ctx: commands.Context, seconds: int = default) -> None:
+    async def play(
+        _,
+        ctx: commands.Context,
+        seconds: int = None,  # type: ignore
+    ) -> None:
+        # Not Optional[int], discord.py would ignore invalid numbers instead
+        # of reporting them. The default is only None when it isn't given.
+        if seconds is None:
+            seconds = default_seconds(ctx, max_countdown)
         await play_audio(
             ctx,
             seconds,
@@ -57,14 +110,91 @@ def create_play_cog_command(
     return play
 
 
-async def play_audio(
-    ctx: commands.Context,
-    seconds: int,
-    command_name: str,
+def create_broadcast_command(
     countdown: Countdown,
-    max_countdown: int,
-) -> None:
-    """Play audio in the message author's voice channel."""
+    max_countdowns: Dict[str, int],
+) -> commands.Command:
+    """Get a command that plays audio in many voice channels at once.
+
+    Like the commands from `create_play_cog_command`, the first argument
+    is unused.
+    """
+
+    @commands.command(
+        name=BROADCAST_COMMAND_NAME, usage="<command> [seconds] <targets...>"
+    )
+    @commands.guild_only()
+    async def broadcast(
+        _,
+        ctx: commands.Context,
+        command_name: str,
+        seconds: Optional[int] = None,
+        *targets: BroadcastTarget,
+    ) -> None:
+        """Count down in several voice channels at the same time
+
+        Targets can be voice channels, or roles to count in every voice
+        channel with a member of that role. Channel IDs from other
+        servers are allowed, but give the number of seconds first.
+        """
+        if command_name not in max_countdowns:
+            fail(f"There's no countdown called '{command_name}'.")
+
+        max_countdown = max_countdowns[command_name]
+        if seconds is None:
+            seconds = default_seconds(ctx, max_countdown)
+        check_seconds(seconds, max_countdown)
+
+        if not targets:
+            fail("Give at least one voice channel or role to count in.")
+
+        # Roles may resolve to channels that were also given directly.
+        channels = {channel.id: channel for target in targets for channel in target}
+
+        try:
+            audio_bytes = countdown(seconds, command_name)
+        except KeyError as e:
+            fail(f"Unable to create audio for '{command_name}'", cause=e)
+
+        await broadcast_audio(ctx, list(channels.values()), seconds, audio_bytes)
+
+    return broadcast
+
+
+def create_renders_command(countdown: Countdown) -> commands.Command:
+    """Get a command that shows how well rendered audio is being reused.
+
+    Like the commands from `create_play_cog_command`, the first argument
+    is unused.
+    """
+
+    @commands.command(name=RENDERS_COMMAND_NAME)
+    @commands.is_owner()
+    async def renders(_, ctx: commands.Context) -> None:
+        """Show the render cache hit rate and most popular countdowns"""
+        stats = countdown.stats()
+        lines = [
+            f"Hit rate: {stats.hit_rate:.1%} ({stats.hits} hits, {stats.misses} misses)",
+            f"Resident: {stats.resident} renders, {stats.resident_bytes / 2**20:.1f} MiB",
+        ]
+        for seconds, command in countdown.popularity.most_popular(10):
+            score = countdown.popularity.score((seconds, command))
+            lines.append(f"{command} {seconds}: {score:.2f}")
+        summary = "\n".join(lines)
+        await ctx.send(f"```\n{summary}\n```")
+
+    return renders
+
+
+def default_seconds(ctx: commands.Context, max_countdown: int) -> int:
+    """Get the number to count down from when it isn't given."""
+    guild_id = ctx.guild.id if ctx.guild else None
+    seconds = settings.get(ctx.bot, guild_id, GuildSetting.COUNTDOWN, 3)
+    return min(seconds, max_countdown)  # type: ignore
+
+
+def check_seconds(seconds: int, max_countdown: int) -> None:
+    """Fail if the number of seconds can't be counted down from."""
     if seconds > max_countdown:
         logger.error("Number to count from was greater than the maximum allowed.")
         fail(f"Too long, use a number under {max_countdown}.")
@@ -73,6 +203,17 @@ async def play_audio(
         logger.error("Number was under 0, unable to count.")
         fail(f"Can't count down from numbers below 0, please use a positive number.")
 
+
+async def play_audio(
+    ctx: commands.Context,
+    seconds: int,
+    command_name: str,
+    countdown: Countdown,
+    max_countdown: int,
+) -> None:
+    """Play audio in the message author's voice channel."""
+    check_seconds(seconds, max_countdown)
+
     if ctx.voice_client:
         logger.error(f"Voice client already exists for guild: {ctx.guild!r}.")
         fail("Already counting in your server.")
@@ -95,6 +236,7 @@ async def play_audio(
 
     audio_reader = io.BytesIO(audio_bytes)
     audio = discord.PCMAudio(audio_reader)
+    audio = telemetry.wrap_source(ctx.bot, ctx.guild, audio)
 
     await asyncio.sleep(0.5)
 
@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+import json
+import math
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from loguru import logger
+
+RenderKey = Tuple[int, str]
+
+# A use from a week ago counts for half as much as one from right now.
+DEFAULT_HALF_LIFE = 7 * 24 * 60 * 60
+
+
+class Popularity:
+    """Count how often each countdown is used, favouring recent uses.
+
+    Scores decay exponentially, so they're stored with the time they were
+    last updated and decayed lazily when they're read.
+    """
+
+    def __init__(self, half_life: float = DEFAULT_HALF_LIFE) -> None:
+        self.half_life = half_life
+        self._scores: Dict[RenderKey, Tuple[float, float]] = {}
+        self._lock = threading.Lock()
+        # Held for a whole save, so saves from the executor and teardown
+        # don't write the same temporary file at once.
+        self._save_lock = threading.Lock()
+        self._dirty = False
+
+    @property
+    def dirty(self) -> bool:
+        """Whether there are uses that haven't been saved yet."""
+        return self._dirty
+
+    def _decayed(self, score: float, updated: float, now: float) -> float:
+        elapsed = max(0.0, now - updated)
+        return score * math.pow(0.5, elapsed / self.half_life)
+
+    def hit(self, key: RenderKey, now: Optional[float] = None) -> None:
+        """Record a use of the key."""
+        now = time.time() if now is None else now
+        with self._lock:
+            score, updated = self._scores.get(key, (0.0, now))
+            self._scores[key] = (self._decayed(score, updated, now) + 1, now)
+            self._dirty = True
+
+    def score(self, key: RenderKey, now: Optional[float] = None) -> float:
+        """Get the current score of the key, 0 if it's never been used."""
+        now = time.time() if now is None else now
+        score, updated = self._scores.get(key, (0.0, now))
+        return self._decayed(score, updated, now)
+
+    def most_popular(self, count: Optional[int] = None) -> List[RenderKey]:
+        """Get the keys with the highest scores, most popular first."""
+        now = time.time()
+        with self._lock:
+            keys = list(self._scores)
+        keys.sort(key=lambda key: self.score(key, now), reverse=True)
+        return keys[:count]
+
+    @classmethod
+    def load(cls, path: Path, half_life: float = DEFAULT_HALF_LIFE) -> Popularity:
+        """Load scores saved by `save`, or start fresh if that fails."""
+        popularity = cls(half_life)
+
+        if not path.exists():
+            return popularity
+
+        try:
+            entries = json.loads(path.read_text())
+            for entry in entries:
+                key = (int(entry["seconds"]), str(entry["command"]))
+                score = (float(entry["score"]), float(entry["updated"]))
+                popularity._scores[key] = score
+        except (OSError, ValueError, TypeError, KeyError) as e:
+            logger.warning(f"Ignoring unreadable popularity file '{path}': {e!r}")
+            popularity._scores.clear()
+
+        return popularity
+
+    def save(self, path: Path) -> None:
+        """Save the scores to a file so they survive a restart."""
+        with self._save_lock:
+            with self._lock:
+                scores = list(self._scores.items())
+                self._dirty = False
+
+            entries = [
+                {
+                    "command": command,
+                    "seconds": seconds,
+                    "score": score,
+                    "updated": updated,
+                }
+                for (seconds, command), (score, updated) in scores
+            ]
+            # Replacing the file means a crash while saving can't corrupt it.
+            temporary = path.with_name(f"{path.name}.tmp")
+            try:
+                path.parent.mkdir(parents=True, exist_ok=True)
+                temporary.write_text(json.dumps(entries, indent=2))
+                os.replace(temporary, path)
+            except OSError:
+                self._dirty = True
+                raise
@@ -0,0 +1,8 @@
+__all__ = (
+    "install",
+    "get",
+    "set",
+    "reset",
+)
+
+from count.settings.settings import get, install, reset, set
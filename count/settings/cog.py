@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+import asyncio
+from typing import Optional, Type, TypeVar
+
+import discord.ext.commands as commands
+from loguru import logger
+
+from count.common import GuildSetting
+from count.errors import fail
+from count.settings.store import GuildSettingsStore
+
+Cls = TypeVar("Cls")
+
+# How long changes can wait in memory before they're written to disk.
+FLUSH_INTERVAL = 5
+MAX_PREFIX_LENGTH = 16
+
+
+class SettingsCog(commands.Cog, name="Settings"):
+    def __init__(self, bot: commands.Bot, store: GuildSettingsStore) -> None:
+        self.bot = bot
+        self.store = store
+        self._flush_task = bot.loop.create_task(self.flush_periodically())
+
+    def cog_unload(self) -> None:
+        self._flush_task.cancel()
+        # The bot might be closing, so write everything before it's gone.
+        try:
+            self.store.flush()
+        except Exception:
+            logger.exception("Failed to write guild settings, changes were lost:")
+
+    async def flush_periodically(self) -> None:
+        loop = asyncio.get_event_loop()
+        while True:
+            await asyncio.sleep(FLUSH_INTERVAL)
+            if not self.store.dirty:
+                continue
+            try:
+                await loop.run_in_executor(None, self.store.flush)
+            except Exception:
+                logger.exception("Failed to write guild settings, will retry:")
+
+    @classmethod
+    def get_instance(cls: Type[Cls], bot: commands.Bot) -> Optional[Cls]:
+        # See ConfigCog.get_instance
+        return bot.get_cog(cls.__cog_name__)  # type: ignore
+
+    @commands.group()
+    @commands.guild_only()
+    @commands.has_guild_permissions(manage_guild=True)
+    async def settings(self, ctx: commands.Context) -> None:
+        """Change how the bot works in this server"""
+        if ctx.subcommand_passed:
+            return
+
+        lines = []
+        for setting in GuildSetting:
+            value = self.store.get(ctx.guild.id, setting, None)
+            shown = "(default)" if value is None else f"'{value}'"
+            lines.append(f"{setting.value}: {shown}")
+        summary = "\n".join(lines)
+        await ctx.send(f"```\n{summary}\n```")
+
+    @settings.command(name="prefix")
+    async def settings_prefix(self, ctx: commands.Context, prefix: str) -> None:
+        """Set the prefix used to invoke commands"""
+        if not prefix or len(prefix) > MAX_PREFIX_LENGTH:
+            fail(f"The prefix must be 1-{MAX_PREFIX_LENGTH} characters long.")
+
+        self.store.set(ctx.guild.id, GuildSetting.PREFIX, prefix)
+        await ctx.message.add_reaction("✅")
+
+    @settings.command(name="countdown")
+    async def settings_countdown(self, ctx: commands.Context, seconds: int) -> None:
+        """Set the number to count down from when none is given"""
+        if seconds < 0:
+            fail("Can't count down from numbers below 0, please use a positive number.")
+
+        self.store.set(ctx.guild.id, GuildSetting.COUNTDOWN, seconds)
+        await ctx.message.add_reaction("✅")
+
+    @settings.command(name="reset")
+    async def settings_reset(self, ctx: commands.Context, name: str) -> None:
+        """Go back to the default value of a setting"""
+        try:
+            setting = GuildSetting(name.lower())
+        except ValueError:
+            names = ", ".join(setting.value for setting in GuildSetting)
+            fail(f"There's no setting called '{name}', try one of: {names}")
+
+        self.store.reset(ctx.guild.id, setting)
+        await ctx.message.add_reaction("✅")
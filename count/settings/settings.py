@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Optional
+
+import discord.ext.commands as commands
+
+from count.common import GuildSetting
+from count.settings.cog import SettingsCog
+from count.settings.store import GuildSettingsStore
+
+
+def install(bot: commands.Bot, path: Path) -> None:
+    """Load per-guild settings from the database at the path."""
+    if SettingsCog.get_instance(bot):
+        return None
+    store = GuildSettingsStore(path)
+    store.load()
+    bot.add_cog(SettingsCog(bot, store))
+
+
+def get(
+    bot: commands.Bot,
+    guild_id: Optional[int],
+    setting: GuildSetting,
+    default: object = None,
+) -> object:
+    """Get a setting of a guild, or the default if it isn't set.
+
+    This is only a couple of dict lookups, it's safe to call per message.
+    """
+    conf = SettingsCog.get_instance(bot)
+    if not conf or guild_id is None:
+        return default
+    return conf.store.get(guild_id, setting, default)
+
+
+def set(bot: commands.Bot, guild_id: int, setting: GuildSetting, value: object) -> bool:
+    """Set a setting of a guild. It will be written to disk later.
+
+    Returns True if the value was set successfully.
+    """
+    conf = SettingsCog.get_instance(bot)
+    if not conf:
+        return False
+    conf.store.set(guild_id, setting, value)
+    return True
+
+
+def reset(bot: commands.Bot, guild_id: int, setting: GuildSetting) -> bool:
+    """Reset a setting of a guild to the default.
+
+    Returns True if the value was reset successfully.
+    """
+    conf = SettingsCog.get_instance(bot)
+    if not conf:
+        return False
+    conf.store.reset(guild_id, setting)
+    return True
@@ -0,0 +1,109 @@
+from __future__ import annotations
+
+import json
+import sqlite3
+import threading
+from contextlib import closing
+from pathlib import Path
+from typing import Dict, Tuple
+
+from loguru import logger
+
+from count.common import GuildSetting
+
+PendingKey = Tuple[int, str]
+
+# Marks a pending write that removes the setting.
+_DELETED = object()
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS guild_settings (
+    guild_id INTEGER NOT NULL,
+    key TEXT NOT NULL,
+    value TEXT NOT NULL,
+    PRIMARY KEY (guild_id, key)
+)
+"""
+
+
+class GuildSettingsStore:
+    """Per-guild settings, cached in memory and written to SQLite later.
+
+    Reads and writes only touch the in-memory cache. Writes are queued
+    until `flush` writes them all to disk in a single transaction, and
+    repeated writes to the same setting are collapsed into one.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self._cache: Dict[GuildSetting, Dict[int, object]] = {
+            setting: {} for setting in GuildSetting
+        }
+        self._pending: Dict[PendingKey, object] = {}
+        self._pending_lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+
+    @property
+    def dirty(self) -> bool:
+        return bool(self._pending)
+
+    def load(self) -> None:
+        """Read every setting from disk into the cache."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with closing(sqlite3.connect(str(self.path))) as db, db:
+            db.execute(SCHEMA)
+            rows = db.execute("SELECT guild_id, key, value FROM guild_settings")
+            for guild_id, key, value in rows:
+                try:
+                    setting = GuildSetting(key)
+                except ValueError:
+                    logger.warning(f"Ignoring unknown setting '{key}' for {guild_id}")
+                    continue
+                self._cache[setting][guild_id] = json.loads(value)
+
+    def get(self, guild_id: int, setting: GuildSetting, default: object) -> object:
+        return self._cache[setting].get(guild_id, default)
+
+    def set(self, guild_id: int, setting: GuildSetting, value: object) -> None:
+        self._cache[setting][guild_id] = value
+        with self._pending_lock:
+            self._pending[(guild_id, setting.value)] = value
+
+    def reset(self, guild_id: int, setting: GuildSetting) -> None:
+        self._cache[setting].pop(guild_id, None)
+        with self._pending_lock:
+            self._pending[(guild_id, setting.value)] = _DELETED
+
+    def flush(self) -> None:
+        """Write every queued change to disk. This blocks, a lot."""
+        with self._flush_lock:
+            with self._pending_lock:
+                batch, self._pending = self._pending, {}
+
+            if not batch:
+                return
+
+            upserts = [
+                (guild_id, key, json.dumps(value))
+                for (guild_id, key), value in batch.items()
+                if value is not _DELETED
+            ]
+            deletes = [key for key, value in batch.items() if value is _DELETED]
+
+            try:
+                with closing(sqlite3.connect(str(self.path))) as db, db:
+                    db.executemany(
+                        "INSERT OR REPLACE INTO guild_settings VALUES (?, ?, ?)",
+                        upserts,
+                    )
+                    db.executemany(
+                        "DELETE FROM guild_settings WHERE guild_id = ? AND key = ?",
+                        deletes,
+                    )
+            except sqlite3.Error:
+                # Requeue the batch, unless it's been replaced since.
+                with self._pending_lock:
+                    self._pending = {**batch, **self._pending}
+                raise
+
+            logger.debug(f"Wrote {len(batch)} guild settings to '{self.path}'")
@@ -0,0 +1,7 @@
+__all__ = (
+    "install",
+    "wrap_source",
+    "summary",
+)
+
+from count.telemetry.telemetry import install, summary, wrap_source
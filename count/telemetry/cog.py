@@ -0,0 +1,26 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Dict, Optional, Type, TypeVar
+
+import discord.ext.commands as commands
+
+if TYPE_CHECKING:
+    from count.telemetry.telemetry import FrameStats, LoopLagMonitor
+
+Cls = TypeVar("Cls")
+
+
+class TelemetryCog(commands.Cog, name="Telemetry"):
+    def __init__(self, bot: commands.Bot, lag: LoopLagMonitor) -> None:
+        self.bot = bot
+        self.lag = lag
+        self.frames: Dict[int, FrameStats] = {}
+        self._lag_task = bot.loop.create_task(lag.run())
+
+    def cog_unload(self) -> None:
+        self._lag_task.cancel()
+
+    @classmethod
+    def get_instance(cls: Type[Cls], bot: commands.Bot) -> Optional[Cls]:
+        # See ConfigCog.get_instance
+        return bot.get_cog(cls.__cog_name__)  # type: ignore
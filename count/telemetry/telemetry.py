@@ -0,0 +1,212 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import deque
+from typing import Deque, List, Optional
+
+import discord
+import discord.ext.commands as commands
+from loguru import logger
+
+from count.telemetry.cog import TelemetryCog
+
+# How often the event loop is woken up to measure how late it is.
+LAG_SAMPLE_INTERVAL = 0.25
+LAG_SAMPLE_HISTORY = 1200
+
+# Anything above these is logged as a warning.
+LAG_WARNING_THRESHOLD = 0.1
+LATE_FRAME_WARNING_RATIO = 0.05
+
+# discord.py sends a frame every 20ms, a frame sent 50% later than that
+# is late. Frames aren't dropped when the player falls behind, it sends
+# the backlog without waiting to catch up, so those frames are a burst.
+FRAME_DELAY = discord.player.AudioPlayer.DELAY
+LATE_FRAME_THRESHOLD = FRAME_DELAY * 1.5
+BURST_FRAME_THRESHOLD = FRAME_DELAY * 0.5
+
+# Keeps the summary well under Discord's 2000 character message limit.
+MAX_SUMMARY_GUILDS = 8
+MAX_SUMMARY_GUILD_NAME = 32
+
+
+class LoopLagMonitor:
+    """Measure how long the event loop takes to wake up a sleeping task."""
+
+    def __init__(self) -> None:
+        self.samples: Deque[float] = deque(maxlen=LAG_SAMPLE_HISTORY)
+        self.stalls = 0
+        self.worst = 0.0
+
+    async def run(self) -> None:
+        loop = asyncio.get_event_loop()
+        while True:
+            expected = loop.time() + LAG_SAMPLE_INTERVAL
+            await asyncio.sleep(LAG_SAMPLE_INTERVAL)
+            self.record(loop.time() - expected)
+
+    def record(self, lag: float) -> None:
+        self.samples.append(lag)
+        self.worst = max(self.worst, lag)
+        if lag > LAG_WARNING_THRESHOLD:
+            self.stalls += 1
+            logger.warning(f"Event loop was blocked for {lag * 1000:.1f}ms")
+
+    def summary(self) -> str:
+        if not self.samples:
+            return "Event loop: no samples yet"
+
+        ordered = sorted(self.samples)
+        mean = sum(ordered) / len(ordered)
+        p99 = ordered[int(len(ordered) * 0.99)]
+        return (
+            f"Event loop: mean {mean * 1000:.2f}ms, p99 {p99 * 1000:.2f}ms, "
+            f"worst {self.worst * 1000:.1f}ms, {self.stalls} stalls "
+            f"(last {len(ordered)} samples)"
+        )
+
+
+class FrameStats:
+    """Timings between audio frames being read by the audio player.
+
+    This is updated from the audio player's thread. There's only one
+    player per guild at a time, so each instance only has one writer.
+
+    `behind` is the number of 20ms slots late frames missed, which the
+    player made up for by sending `bursts` frames early. Bursts are left
+    out of the mean, so they don't hide stalls.
+    """
+
+    def __init__(self) -> None:
+        self.playbacks = 0
+        self.frames = 0
+        self.late = 0
+        self.behind = 0
+        self.bursts = 0
+        self.paced_interval = 0.0
+        self.worst_interval = 0.0
+
+    def record(self, interval: float) -> None:
+        self.frames += 1
+        self.worst_interval = max(self.worst_interval, interval)
+        if interval < BURST_FRAME_THRESHOLD:
+            self.bursts += 1
+            return
+        self.paced_interval += interval
+        if interval > LATE_FRAME_THRESHOLD:
+            self.late += 1
+            self.behind += int(interval / FRAME_DELAY) - 1
+
+    def merge(self, other: FrameStats) -> None:
+        self.playbacks += other.playbacks
+        self.frames += other.frames
+        self.late += other.late
+        self.behind += other.behind
+        self.bursts += other.bursts
+        self.paced_interval += other.paced_interval
+        self.worst_interval = max(self.worst_interval, other.worst_interval)
+
+    def late_ratio(self) -> float:
+        return self.late / self.frames if self.frames else 0.0
+
+    def summary(self) -> str:
+        paced = self.frames - self.bursts
+        mean = self.paced_interval / paced if paced else 0.0
+        return (
+            f"{self.playbacks} playbacks, {self.frames} frames, "
+            f"{self.late} late ({self.late_ratio():.1%}), {self.behind} slots behind, "
+            f"{self.bursts} burst, mean {mean * 1000:.2f}ms (excluding bursts), "
+            f"worst {self.worst_interval * 1000:.1f}ms"
+        )
+
+
+class TimedAudioSource(discord.AudioSource):
+    """Record the time between frames being read from another source."""
+
+    def __init__(
+        self,
+        source: discord.AudioSource,
+        guild: discord.Guild,
+        totals: FrameStats,
+    ) -> None:
+        self.source = source
+        self.guild = guild
+        self.totals = totals
+        self.stats = FrameStats()
+        self.stats.playbacks = 1
+        self._last_read: Optional[float] = None
+        self._merged = False
+
+    def read(self) -> bytes:
+        # Timed after reading, a source may block before its first frame.
+        data = self.source.read()
+        now = time.perf_counter()
+        if self._last_read is not None:
+            self.stats.record(now - self._last_read)
+        self._last_read = now
+        return data
+
+    def is_opus(self) -> bool:
+        return self.source.is_opus()
+
+    def cleanup(self) -> None:
+        # Called from the audio player's thread once playback finishes,
+        # and again when garbage collected.
+        self.source.cleanup()
+        if self._merged:
+            return
+        self._merged = True
+        self.totals.merge(self.stats)
+
+        if self.stats.late_ratio() > LATE_FRAME_WARNING_RATIO:
+            summary = self.stats.summary()
+            logger.warning(f"Audio frames were late in '{self.guild}': {summary}")
+
+
+def install(bot: commands.Bot) -> None:
+    """Start monitoring the event loop and allow audio to be monitored."""
+    if TelemetryCog.get_instance(bot):
+        return None
+    bot.add_cog(TelemetryCog(bot, LoopLagMonitor()))
+
+
+def wrap_source(
+    bot: commands.Bot,
+    guild: discord.Guild,
+    source: discord.AudioSource,
+) -> discord.AudioSource:
+    """Wrap an audio source to record its frame timings for the guild.
+
+    If telemetry isn't installed, the source is returned unchanged.
+    """
+    telemetry = TelemetryCog.get_instance(bot)
+    if not telemetry:
+        return source
+    totals = telemetry.frames.setdefault(guild.id, FrameStats())
+    return TimedAudioSource(source, guild, totals)
+
+
+def summary(bot: commands.Bot) -> Optional[str]:
+    """Summarize event loop lag and the audio frame timings of the guilds
+    with the most late frames.
+    """
+    telemetry = TelemetryCog.get_instance(bot)
+    if not telemetry:
+        return None
+
+    worst = sorted(
+        telemetry.frames.items(),
+        key=lambda item: item[1].late_ratio(),
+        reverse=True,
+    )
+
+    lines: List[str] = [telemetry.lag.summary()]
+    for guild_id, stats in worst[:MAX_SUMMARY_GUILDS]:
+        name = str(bot.get_guild(guild_id) or guild_id)[:MAX_SUMMARY_GUILD_NAME]
+        lines.append(f"'{name}': {stats.summary()}")
+
+    hidden = len(worst) - MAX_SUMMARY_GUILDS
+    if hidden > 0:
+        lines.append(f"...and {hidden} more guilds with fewer late frames")
+    return "\n".join(lines)